@@ -3,9 +3,54 @@ Chatbot Module
 Handles conversation flow and response generation
 """
 
-from typing import List, Tuple
+from collections import deque
+from itertools import chain
+from typing import Deque, List, Optional, Tuple
 import random
-from sentiment_analyzer import SentimentAnalyzer
+import re
+from sentiment_analyzer import NEGATIVE, NEUTRAL, POSITIVE, SentimentAnalyzer, SentimentRecord
+
+
+# Intent keyword vocabularies. Keywords match whole words, so inflected
+# forms are listed explicitly. Multi-word phrases are matched against
+# adjacent word pairs of the message.
+_GREETINGS = frozenset({'hello', 'hi', 'hey', 'greetings'})
+_FAREWELLS = frozenset({'bye', 'goodbye', 'farewell', 'see you'})
+_PROBLEMS = frozenset({
+    'problem', 'problems', 'issue', 'issues', 'bug', 'bugs', 'buggy',
+    'error', 'errors', 'broken'
+})
+_PRICES = frozenset({
+    'price', 'prices', 'priced', 'pricing', 'cost', 'costs', 'costly',
+    'expensive', 'cheap', 'cheaper'
+})
+_THANKS = frozenset({
+    'thank', 'thanks', 'thanked', 'thankful', 'appreciate', 'appreciated',
+    'appreciates', 'appreciation'
+})
+
+# Single keyword -> intent table so every category is found in one scan
+_INTENT_KEYWORDS = {
+    keyword: intent
+    for intent, keywords in (
+        ('greeting', _GREETINGS),
+        ('farewell', _FAREWELLS),
+        ('problem', _PROBLEMS),
+        ('price', _PRICES),
+        ('thanks', _THANKS),
+    )
+    for keyword in keywords
+}
+
+# Words with inner apostrophes ("i'm"); quotes around a word are not part of it
+_WORD_RE = re.compile(r"[a-z]+(?:'[a-z]+)*")
+
+
+def _detect_intents(message: str) -> frozenset:
+    """Return the intents whose keywords appear in a message (case-insensitive)"""
+    words = _WORD_RE.findall(message.casefold())
+    candidates = chain(words, map(' '.join, zip(words, words[1:])))
+    return frozenset(filter(None, map(_INTENT_KEYWORDS.get, candidates)))
 
 
 class SentimentChatbot:
@@ -13,49 +58,70 @@ class SentimentChatbot:
     A chatbot that maintains conversation history and provides sentiment-aware responses
     """
     
-    def __init__(self):
-        self.conversation_history: List[Tuple[str, str]] = []
+    # Intent -> reply handler, in priority order. A handler returning None
+    # falls through to the next matched intent.
+    _INTENT_TABLE = (
+        ('greeting', '_reply_greeting'),
+        ('farewell', '_reply_farewell'),
+        ('problem', '_reply_problem'),
+        ('price', '_reply_price'),
+        ('thanks', '_reply_thanks'),
+    )
+    
+    def __init__(self, max_history: Optional[int] = None):
+        """
+        Args:
+            max_history: Optional cap on stored history entries (user and bot
+                turns each count as one). Oldest entries are dropped first.
+                Per-message scores in the analysis cover retained messages;
+                totals, distribution and mood shift cover the whole session.
+        """
+        self.conversation_history: Deque[Tuple[str, str, Optional[SentimentRecord]]] = deque(maxlen=max_history)
         self.sentiment_analyzer = SentimentAnalyzer()
         self.user_name = None
+        self._reset_running_stats()
+        
+        # Private generator for reply selection; seed it for reproducible replies
+        self._rng = random.Random()
         
         # Response templates categorized by sentiment
         self.responses = {
-            'Positive': [
+            POSITIVE: (
                 "That's wonderful to hear! I'm glad you're having a positive experience.",
                 "Great! I'm happy to help you further.",
                 "Excellent! Your satisfaction is important to us.",
                 "That's fantastic! How else can I assist you today?",
                 "I'm thrilled to hear that! Let me know if there's anything else."
-            ],
-            'Negative': [
+            ),
+            NEGATIVE: (
                 "I understand your frustration. Let me help resolve this for you.",
                 "I apologize for the inconvenience. I'll make sure your concern is addressed.",
                 "I'm sorry to hear that. Your feedback is valuable and I want to make this right.",
                 "I hear your concerns. Let's work together to find a solution.",
                 "I appreciate you bringing this to my attention. How can I improve your experience?"
-            ],
-            'Neutral': [
+            ),
+            NEUTRAL: (
                 "I understand. How can I assist you further?",
                 "Thank you for sharing. What else would you like to know?",
                 "Got it. Is there anything specific I can help with?",
                 "I see. Let me know what you need.",
                 "Understood. Feel free to ask me anything."
-            ],
-            'greeting': [
+            ),
+            'greeting': (
                 "Hello! I'm here to help you. How are you doing today?",
                 "Hi there! Welcome! What can I do for you?",
                 "Greetings! I'm ready to assist you with anything you need.",
                 "Hey! Great to chat with you. What's on your mind?"
-            ],
-            'farewell': [
+            ),
+            'farewell': (
                 "Thank you for chatting with me! Have a wonderful day!",
                 "Goodbye! Feel free to reach out anytime.",
                 "Take care! It was nice talking with you.",
                 "Farewell! Hope to chat again soon!"
-            ]
+            )
         }
     
-    def process_message(self, user_message: str) -> Tuple[str, dict]:
+    def process_message(self, user_message: str) -> Tuple[str, SentimentRecord]:
         """
         Process user message and generate appropriate response
         
@@ -65,17 +131,24 @@ class SentimentChatbot:
         Returns:
             Tuple of (bot_response, sentiment_analysis)
         """
-        # Analyze sentiment of user message
+        # Analyze sentiment of user message. This stays synchronous: VADER is
+        # pure Python (holds the GIL) and the result is returned to the caller
+        # on every path, so a worker thread cannot take it off the critical path.
         sentiment = self.sentiment_analyzer.analyze_message(user_message)
         
-        # Store in conversation history
-        self.conversation_history.append(('user', user_message))
+        # Store in conversation history alongside its sentiment so the
+        # conversation analysis does not need to re-run VADER
+        self.conversation_history.append(('user', user_message, sentiment))
+        
+        # Fold the sentiment into the running conversation statistics
+        self._prefix_sums.append(self._prefix_sums[-1] + sentiment.compound)
+        self._bucket_counts[sentiment.label] += 1
         
         # Generate response based on sentiment and content
-        bot_response = self._generate_response(user_message, sentiment['label'])
+        bot_response = self._generate_response(user_message, sentiment.label)
         
         # Store bot response in history
-        self.conversation_history.append(('bot', bot_response))
+        self.conversation_history.append(('bot', bot_response, None))
         
         return bot_response, sentiment
     
@@ -83,42 +156,65 @@ class SentimentChatbot:
         """
         Generate contextually appropriate response
         """
-        message_lower = message.lower()
+        intents = _detect_intents(message)
         
-        # Check for greetings
-        if any(word in message_lower for word in ['hello', 'hi', 'hey', 'greetings']):
-            if not self.user_name:
-                return random.choice(self.responses['greeting'])
-        
-        # Check for farewells
-        if any(word in message_lower for word in ['bye', 'goodbye', 'farewell', 'see you']):
-            return random.choice(self.responses['farewell'])
-        
-        # Check for specific topics and provide contextual responses
-        if any(word in message_lower for word in ['problem', 'issue', 'bug', 'error', 'broken']):
-            return "I'm sorry you're experiencing technical difficulties. Can you provide more details so I can help resolve this?"
-        
-        if any(word in message_lower for word in ['price', 'cost', 'expensive', 'cheap']):
-            if sentiment_label == 'Negative':
-                return "I understand pricing is a concern. Let me see what options might work better for your budget."
-            else:
-                return "I'm happy to discuss pricing options that fit your needs."
-        
-        if any(word in message_lower for word in ['thank', 'thanks', 'appreciate']):
-            return "You're very welcome! Is there anything else I can help you with?"
+        # Intent-specific replies take precedence, in table order
+        for intent, handler_name in self._INTENT_TABLE:
+            if intent in intents:
+                reply = getattr(self, handler_name)(sentiment_label)
+                if reply is not None:
+                    return reply
         
         # Default to sentiment-based response
-        return random.choice(self.responses.get(sentiment_label, self.responses['Neutral']))
+        return self._rng.choice(self.responses.get(sentiment_label, self.responses[NEUTRAL]))
+    
+    def _reply_greeting(self, sentiment_label: str) -> Optional[str]:
+        """Greet the user, unless they are already known"""
+        if not self.user_name:
+            return self._rng.choice(self.responses['greeting'])
+        return None
+    
+    def _reply_farewell(self, sentiment_label: str) -> str:
+        """Say goodbye"""
+        return self._rng.choice(self.responses['farewell'])
     
-    def get_conversation_history(self) -> List[Tuple[str, str]]:
-        """Return full conversation history"""
-        return self.conversation_history
+    def _reply_problem(self, sentiment_label: str) -> str:
+        """Acknowledge a reported problem"""
+        return "I'm sorry you're experiencing technical difficulties. Can you provide more details so I can help resolve this?"
+    
+    def _reply_price(self, sentiment_label: str) -> str:
+        """Respond to a pricing question, softer when the user is unhappy"""
+        if sentiment_label == NEGATIVE:
+            return "I understand pricing is a concern. Let me see what options might work better for your budget."
+        else:
+            return "I'm happy to discuss pricing options that fit your needs."
+    
+    def _reply_thanks(self, sentiment_label: str) -> str:
+        """Acknowledge thanks"""
+        return "You're very welcome! Is there anything else I can help you with?"
+    
+    def get_conversation_history(self) -> List[Tuple[str, str, Optional[SentimentRecord]]]:
+        """Return stored conversation history (the latest max_history entries, if bounded)"""
+        return list(self.conversation_history)
     
     def get_conversation_analysis(self) -> dict:
         """Get comprehensive sentiment analysis of entire conversation"""
-        return self.sentiment_analyzer.analyze_conversation(self.conversation_history)
+        return self.sentiment_analyzer.summarize(
+            self._prefix_sums, self._bucket_counts, self._retained_scores()
+        )
+    
+    def _retained_scores(self) -> List[SentimentRecord]:
+        """Sentiment of each user message still held in the history"""
+        return [sentiment for role, _, sentiment in self.conversation_history if role == 'user']
     
     def reset_conversation(self):
         """Clear conversation history"""
-        self.conversation_history = []
-        self.user_name = None
\ No newline at end of file
+        self.conversation_history.clear()
+        self.user_name = None
+        self._reset_running_stats()
+    
+    def _reset_running_stats(self):
+        """Clear the per-conversation sentiment aggregates kept by process_message"""
+        # Running sums of user compound scores; _prefix_sums[i] covers the first i
+        self._prefix_sums: List[float] = [0.0]
+        self._bucket_counts = {POSITIVE: 0, NEUTRAL: 0, NEGATIVE: 0}
\ No newline at end of file
@@ -5,11 +5,26 @@ Provides CLI interface for interaction
 
 import sys
 from chatbot import SentimentChatbot
+from sentiment_analyzer import NEGATIVE, NEUTRAL, POSITIVE, SentimentRecord
 from colorama import init, Fore, Style
 
 # Initialize colorama for cross-platform colored terminal output
 init(autoreset=True)
 
+# Color codes and common prefixes, built once instead of on every print
+C_CYAN = Fore.CYAN
+C_GREEN = Fore.GREEN
+C_RED = Fore.RED
+C_YELLOW = Fore.YELLOW
+C_WHITE = Fore.WHITE
+C_RESET = Style.RESET_ALL
+
+SENT_COLOR = {POSITIVE: C_GREEN, NEGATIVE: C_RED, NEUTRAL: C_YELLOW}
+
+_SEP = C_CYAN + '=' * 70
+_USER_PROMPT = f"{Fore.BLUE}You: {C_RESET}"
+_BOT_PREFIX = f"{Fore.MAGENTA}Bot: {C_RESET}"
+
 
 class ChatbotCLI:
     """Command-line interface for the chatbot"""
@@ -20,27 +35,22 @@ class ChatbotCLI:
         
     def display_welcome(self):
         """Display welcome message"""
-        print(f"\n{Fore.CYAN}{'='*70}")
-        print(f"{Fore.CYAN}  SENTIMENT ANALYSIS CHATBOT")
-        print(f"{Fore.CYAN}{'='*70}")
-        print(f"{Fore.GREEN}\n✓ Tier 1: Conversation-level sentiment analysis")
-        print(f"{Fore.GREEN}✓ Tier 2: Statement-level sentiment analysis")
-        print(f"\n{Fore.YELLOW}Type 'quit' or 'exit' to end conversation and see analysis")
-        print(f"{Fore.YELLOW}Type 'toggle' to enable/disable statement-level sentiment display")
-        print(f"{Fore.CYAN}{'='*70}\n")
+        print(f"\n{_SEP}")
+        print(f"{C_CYAN}  SENTIMENT ANALYSIS CHATBOT")
+        print(_SEP)
+        print(f"{C_GREEN}\n✓ Tier 1: Conversation-level sentiment analysis")
+        print(f"{C_GREEN}✓ Tier 2: Statement-level sentiment analysis")
+        print(f"\n{C_YELLOW}Type 'quit' or 'exit' to end conversation and see analysis")
+        print(f"{C_YELLOW}Type 'toggle' to enable/disable statement-level sentiment display")
+        print(f"{_SEP}\n")
     
-    def display_sentiment(self, sentiment: dict):
+    def display_sentiment(self, sentiment: SentimentRecord):
         """Display sentiment with color coding"""
-        label = sentiment['label']
-        compound = sentiment['compound']
+        label = sentiment.label
+        compound = sentiment.compound
         
         # Color code based on sentiment
-        if label == 'Positive':
-            color = Fore.GREEN
-        elif label == 'Negative':
-            color = Fore.RED
-        else:
-            color = Fore.YELLOW
+        color = SENT_COLOR[label]
         
         print(f"{color}→ Sentiment: {label} (score: {compound:.3f})")
     
@@ -48,66 +58,48 @@ class ChatbotCLI:
         """Display comprehensive conversation analysis (Tier 1 + Tier 2 enhancements)"""
         analysis = self.chatbot.get_conversation_analysis()
         
-        print(f"\n{Fore.CYAN}{'='*70}")
-        print(f"{Fore.CYAN}  CONVERSATION ANALYSIS")
-        print(f"{Fore.CYAN}{'='*70}\n")
+        print(f"\n{_SEP}")
+        print(f"{C_CYAN}  CONVERSATION ANALYSIS")
+        print(f"{_SEP}\n")
         
         # Overall sentiment (Tier 1 requirement)
         overall = analysis['overall_sentiment']
-        if overall == 'Positive':
-            color = Fore.GREEN
-        elif overall == 'Negative':
-            color = Fore.RED
-        else:
-            color = Fore.YELLOW
+        color = SENT_COLOR[overall]
         
-        print(f"{Fore.WHITE}Overall Conversation Sentiment: {color}{overall}")
-        print(f"{Fore.WHITE}Compound Score: {color}{analysis['compound_score']}")
-        print(f"{Fore.WHITE}Total User Messages: {analysis['message_count']}\n")
+        print(f"{C_WHITE}Overall Conversation Sentiment: {color}{overall}")
+        print(f"{C_WHITE}Compound Score: {color}{analysis['compound_score']}")
+        print(f"{C_WHITE}Total User Messages: {analysis['message_count']}\n")
         
         # Sentiment distribution
-        print(f"{Fore.CYAN}Sentiment Distribution:")
+        print(f"{C_CYAN}Sentiment Distribution:")
         dist = analysis['sentiment_distribution']
+        message_count = analysis['message_count']
+        to_percent = 100.0 / message_count if message_count else 0.0
         for sentiment_type, count in dist.items():
-            if sentiment_type == 'Positive':
-                color = Fore.GREEN
-            elif sentiment_type == 'Negative':
-                color = Fore.RED
-            else:
-                color = Fore.YELLOW
-            
-            percentage = (count / analysis['message_count'] * 100) if analysis['message_count'] > 0 else 0
+            color = SENT_COLOR[sentiment_type]
+            percentage = count * to_percent
             print(f"  {color}{sentiment_type}: {count} messages ({percentage:.1f}%)")
         
         # Mood shift analysis (Tier 2 enhancement)
-        print(f"\n{Fore.CYAN}Mood Shift Analysis:")
-        print(f"{Fore.WHITE}  {analysis['mood_shift']}")
+        print(f"\n{C_CYAN}Mood Shift Analysis:")
+        print(f"{C_WHITE}  {analysis['mood_shift']}")
         
         # Message-by-message breakdown (Tier 2)
-        print(f"\n{Fore.CYAN}{'='*70}")
-        print(f"{Fore.CYAN}  MESSAGE-BY-MESSAGE BREAKDOWN (TIER 2)")
-        print(f"{Fore.CYAN}{'='*70}\n")
+        print(f"\n{_SEP}")
+        print(f"{C_CYAN}  MESSAGE-BY-MESSAGE BREAKDOWN (TIER 2)")
+        print(f"{_SEP}\n")
         
         history = self.chatbot.get_conversation_history()
-        user_msg_index = 0
         
-        for role, message in history:
+        for role, message, sentiment in history:
             if role == 'user':
-                sentiment = analysis['individual_scores'][user_msg_index]
-                label = sentiment['label']
-                
-                if label == 'Positive':
-                    color = Fore.GREEN
-                elif label == 'Negative':
-                    color = Fore.RED
-                else:
-                    color = Fore.YELLOW
+                label = sentiment.label
+                color = SENT_COLOR[label]
                 
-                print(f"{Fore.WHITE}User: \"{message}\"")
-                print(f"{color}  → Sentiment: {label} (score: {sentiment['compound']:.3f})\n")
-                user_msg_index += 1
+                print(f"{C_WHITE}User: \"{message}\"")
+                print(f"{color}  → Sentiment: {label} (score: {sentiment.compound:.3f})\n")
         
-        print(f"{Fore.CYAN}{'='*70}\n")
+        print(f"{_SEP}\n")
     
     def run(self):
         """Main conversation loop"""
@@ -116,21 +108,21 @@ class ChatbotCLI:
         while True:
             try:
                 # Get user input
-                user_input = input(f"{Fore.BLUE}You: {Style.RESET_ALL}").strip()
+                user_input = input(_USER_PROMPT).strip()
                 
                 if not user_input:
                     continue
                 
                 # Check for exit commands
                 if user_input.lower() in ['quit', 'exit', 'bye', 'goodbye']:
-                    print(f"\n{Fore.CYAN}Ending conversation...\n")
+                    print(f"\n{C_CYAN}Ending conversation...\n")
                     break
                 
                 # Check for toggle command
                 if user_input.lower() == 'toggle':
                     self.show_tier2 = not self.show_tier2
                     status = "enabled" if self.show_tier2 else "disabled"
-                    print(f"{Fore.YELLOW}Statement-level sentiment display {status}\n")
+                    print(f"{C_YELLOW}Statement-level sentiment display {status}\n")
                     continue
                 
                 # Process message through chatbot
@@ -141,20 +133,20 @@ class ChatbotCLI:
                     self.display_sentiment(sentiment)
                 
                 # Display bot response
-                print(f"{Fore.MAGENTA}Bot: {Style.RESET_ALL}{bot_response}\n")
+                print(f"{_BOT_PREFIX}{bot_response}\n")
                 
             except KeyboardInterrupt:
-                print(f"\n\n{Fore.CYAN}Conversation interrupted...\n")
+                print(f"\n\n{C_CYAN}Conversation interrupted...\n")
                 break
             except Exception as e:
-                print(f"{Fore.RED}Error: {str(e)}\n")
+                print(f"{C_RED}Error: {str(e)}\n")
                 continue
         
         # Display final analysis if there were messages
-        if len(self.chatbot.get_conversation_history()) > 0:
+        if len(self.chatbot.conversation_history) > 0:
             self.display_conversation_analysis()
         else:
-            print(f"{Fore.YELLOW}No conversation to analyze.\n")
+            print(f"{C_YELLOW}No conversation to analyze.\n")
 
 
 def main():
@@ -3,20 +3,83 @@ Sentiment Analyzer Module
 Handles sentiment analysis for individual messages and conversation history
 """
 
-from typing import Dict, List, Tuple
+import sys
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Tuple
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 
 
+# Sentiment labels, interned so label comparisons are identity checks
+POSITIVE = sys.intern('Positive')
+NEGATIVE = sys.intern('Negative')
+NEUTRAL = sys.intern('Neutral')
+
+
+class SentimentRecord(NamedTuple):
+    """
+    Sentiment scores and label for a single message
+    
+    Fields are also readable by key (record['label']) so callers written
+    against the former dict result keep working; use _asdict() where a
+    real dict is needed. Membership (in) keeps plain tuple semantics.
+    """
+    compound: float
+    positive: float
+    neutral: float
+    negative: float
+    label: str
+    
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        return tuple.__getitem__(self, key)
+
+
+# Mood shift descriptions indexed by the sign of the half-to-half change
+_MOOD_SHIFTS = (
+    "Declining (conversation became more negative)",
+    "Stable (consistent mood throughout)",
+    "Improving (conversation became more positive)",
+)
+
+# Result for blank messages; matches what VADER itself returns for ''
+_EMPTY_RECORD = SentimentRecord(0.0, 0.0, 0.0, 0.0, NEUTRAL)
+
+
+@lru_cache(maxsize=1)
+def _get_vader() -> SentimentIntensityAnalyzer:
+    """Return the shared VADER analyzer (lexicon is loaded once per process)"""
+    return SentimentIntensityAnalyzer()
+
+
+@lru_cache(maxsize=4096)
+def _analyze_cached(text: str) -> Tuple[float, float, float, float]:
+    """
+    Score a message with VADER, memoized on the raw text
+    
+    Repeated messages ("hi", "thanks", "ok") and re-analysis of history
+    are served from the cache instead of re-running VADER.
+    
+    Returns:
+        Tuple of (compound, pos, neu, neg)
+    """
+    scores = _get_vader().polarity_scores(text)
+    return scores['compound'], scores['pos'], scores['neu'], scores['neg']
+
+
 class SentimentAnalyzer:
     """
     Analyzes sentiment using VADER (Valence Aware Dictionary and sEntiment Reasoner)
     VADER is specifically designed for social media text and performs well on conversational data
+    
+    Scoring goes through the process-wide VADER instance (_get_vader), so
+    creating analyzers is cheap and the lexicon is loaded only once.
     """
     
-    def __init__(self):
-        self.analyzer = SentimentIntensityAnalyzer()
-        
-    def analyze_message(self, message: str) -> Dict[str, any]:
+    def analyze_message(self, message: str) -> SentimentRecord:
         """
         Analyze sentiment of a single message
         
@@ -24,63 +87,114 @@ class SentimentAnalyzer:
             message: User message text
             
         Returns:
-            Dictionary containing sentiment scores and label
+            SentimentRecord containing sentiment scores and label
+        """
+        return self._analyze_text(message)
+    
+    def analyze_batch(self, messages: List[str]) -> List[SentimentRecord]:
+        """
+        Analyze sentiment of several messages at once
+        
+        Args:
+            messages: List of message texts
+            
+        Returns:
+            List of SentimentRecord, one per message, in input order
+        """
+        # Bind the lookup locally so the loop body is just the call
+        analyze = self._analyze_text
+        return [analyze(message) for message in messages]
+    
+    def _analyze_text(self, message: str) -> SentimentRecord:
         """
-        scores = self.analyzer.polarity_scores(message)
+        Score one message, skipping VADER for blank input
+        
+        Shared by analyze_message and analyze_batch.
+        """
+        # Surrounding whitespace does not affect VADER scores, so strip it to
+        # widen cache hits. Case is kept: VADER boosts ALL-CAPS emphasis.
+        text = message.strip()
+        if not text:
+            return _EMPTY_RECORD
+        compound, pos, neu, neg = _analyze_cached(text)
         
         # Determine sentiment label based on compound score
         # VADER compound score ranges from -1 (most negative) to +1 (most positive)
-        sentiment_label = self._get_sentiment_label(scores['compound'])
+        sentiment_label = self._get_sentiment_label(compound)
         
-        return {
-            'compound': scores['compound'],
-            'positive': scores['pos'],
-            'neutral': scores['neu'],
-            'negative': scores['neg'],
-            'label': sentiment_label
-        }
+        return SentimentRecord(compound, pos, neu, neg, sentiment_label)
     
-    def analyze_conversation(self, messages: List[Tuple[str, str]]) -> Dict[str, any]:
+    def analyze_conversation(self, messages: List[Tuple]) -> Dict[str, any]:
         """
         Analyze overall sentiment of entire conversation
         
         Args:
-            messages: List of tuples (role, message_text)
+            messages: List of tuples (role, message_text) or
+                (role, message_text, sentiment). A stored sentiment is
+                reused as-is; entries without one are analyzed here.
             
         Returns:
             Dictionary with overall sentiment analysis and trends
         """
-        user_messages = [msg for role, msg in messages if role == 'user']
+        user_entries = [entry for entry in messages if entry[0] == 'user']
+        
+        # Reuse stored sentiments and analyze entries that lack one in a batch
+        message_sentiments = [entry[2] if len(entry) > 2 else None for entry in user_entries]
+        missing = [i for i, sentiment in enumerate(message_sentiments) if sentiment is None]
+        if missing:
+            analyzed = self.analyze_batch([user_entries[i][1] for i in missing])
+            for i, sentiment in zip(missing, analyzed):
+                message_sentiments[i] = sentiment
+        
+        # Build compound-score prefix sums and count sentiment distribution in one pass
+        prefix_sums = [0.0]
+        sentiment_counts = {POSITIVE: 0, NEUTRAL: 0, NEGATIVE: 0}
+        for sentiment in message_sentiments:
+            prefix_sums.append(prefix_sums[-1] + sentiment['compound'])
+            sentiment_counts[sentiment['label']] += 1
+        
+        return self.summarize(prefix_sums, sentiment_counts, message_sentiments)
+    
+    def summarize(self, prefix_sums: List[float], sentiment_counts: Dict[str, int],
+                  individual_scores: List) -> Dict[str, any]:
+        """
+        Build the conversation analysis from already aggregated scores
         
-        if not user_messages:
+        Lets callers that track scores incrementally (see SentimentChatbot)
+        produce the same report as analyze_conversation in constant time,
+        without re-reading the history.
+        
+        Args:
+            prefix_sums: Running sums of the user messages' compound scores,
+                starting with 0.0 (prefix_sums[i] is the sum of the first i)
+            sentiment_counts: Number of user messages per sentiment label
+            individual_scores: Sentiment of each user message, in order
+            
+        Returns:
+            Dictionary with overall sentiment analysis and trends
+        """
+        message_count = len(prefix_sums) - 1
+        if not message_count:
             return {
-                'overall_sentiment': 'Neutral',
+                'overall_sentiment': NEUTRAL,
                 'compound_score': 0.0,
                 'message_count': 0,
                 'sentiment_distribution': {}
             }
         
-        # Analyze each user message
-        message_sentiments = [self.analyze_message(msg) for msg in user_messages]
-        
         # Calculate average compound score
-        avg_compound = sum(s['compound'] for s in message_sentiments) / len(message_sentiments)
-        
-        # Count sentiment distribution
-        sentiment_counts = {'Positive': 0, 'Neutral': 0, 'Negative': 0}
-        for sentiment in message_sentiments:
-            sentiment_counts[sentiment['label']] += 1
+        avg_compound = prefix_sums[-1] / message_count
         
         # Detect mood shift (compare first half vs second half)
-        mood_shift = self._detect_mood_shift(message_sentiments)
+        mood_shift = self._detect_mood_shift(prefix_sums)
         
         return {
             'overall_sentiment': self._get_sentiment_label(avg_compound),
             'compound_score': round(avg_compound, 3),
-            'message_count': len(user_messages),
-            'sentiment_distribution': sentiment_counts,
+            'message_count': message_count,
+            'sentiment_distribution': dict(sentiment_counts),
             'mood_shift': mood_shift,
-            'individual_scores': message_sentiments
+            'individual_scores': individual_scores
         }
     
     def _get_sentiment_label(self, compound_score: float) -> str:
@@ -93,29 +207,27 @@ class SentimentAnalyzer:
         - Between: Neutral
         """
         if compound_score >= 0.05:
-            return 'Positive'
+            return POSITIVE
         elif compound_score <= -0.05:
-            return 'Negative'
+            return NEGATIVE
         else:
-            return 'Neutral'
+            return NEUTRAL
     
-    def _detect_mood_shift(self, sentiments: List[Dict]) -> str:
+    def _detect_mood_shift(self, prefix_sums: List[float]) -> str:
         """
         Detect if there's a significant mood shift in conversation
-        Compares first half with second half
+        Compares average compound score of first half with second half,
+        read from the compound-score prefix sums in constant time
         """
-        if len(sentiments) < 2:
+        message_count = len(prefix_sums) - 1
+        if message_count < 2:
             return "Insufficient data"
         
-        mid_point = len(sentiments) // 2
-        first_half_avg = sum(s['compound'] for s in sentiments[:mid_point]) / mid_point
-        second_half_avg = sum(s['compound'] for s in sentiments[mid_point:]) / (len(sentiments) - mid_point)
+        mid_point = message_count // 2
+        first_half_avg = prefix_sums[mid_point] / mid_point
+        second_half_avg = (prefix_sums[-1] - prefix_sums[mid_point]) / (message_count - mid_point)
         
         diff = second_half_avg - first_half_avg
         
-        if diff > 0.2:
-            return "Improving (conversation became more positive)"
-        elif diff < -0.2:
-            return "Declining (conversation became more negative)"
-        else:
-            return "Stable (consistent mood throughout)"
\ No newline at end of file
+        # (diff > 0.2) - (diff < -0.2) is -1, 0 or 1; shift it to index _MOOD_SHIFTS
+        return _MOOD_SHIFTS[(diff > 0.2) - (diff < -0.2) + 1]
\ No newline at end of file
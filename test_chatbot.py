@@ -3,8 +3,9 @@ Unit Tests for Sentiment Analysis Chatbot
 """
 
 import pytest
-from sentiment_analyzer import SentimentAnalyzer
-from chatbot import SentimentChatbot
+from itertools import accumulate
+from sentiment_analyzer import SentimentAnalyzer, SentimentRecord, _analyze_cached, _get_vader
+from chatbot import SentimentChatbot, _detect_intents
 
 
 class TestSentimentAnalyzer:
@@ -14,6 +15,13 @@ class TestSentimentAnalyzer:
         """Setup test fixtures"""
         self.analyzer = SentimentAnalyzer()
     
+    def test_vader_analyzer_is_shared(self):
+        """Test analyzers share one VADER instance instead of reloading the lexicon"""
+        self.analyzer.analyze_message("Warm up the shared analyzer")
+        loads_before = _get_vader.cache_info().misses
+        SentimentAnalyzer().analyze_message("Another analyzer, same lexicon")
+        assert _get_vader.cache_info().misses == loads_before
+    
     def test_positive_sentiment(self):
         """Test detection of positive sentiment"""
         result = self.analyzer.analyze_message("I love this service! It's amazing!")
@@ -32,6 +40,38 @@ class TestSentimentAnalyzer:
         assert result['label'] == 'Neutral'
         assert abs(result['compound']) < 0.05
     
+    def test_sentiment_record_mapping_access(self):
+        """Test sentiment records support attribute and key access"""
+        result = self.analyzer.analyze_message("I love this service!")
+        assert isinstance(result, SentimentRecord)
+        assert result['compound'] == result.compound
+        assert result['label'] == result.label
+        assert result._asdict()['label'] == result.label
+        assert result.label in result
+        assert 'label' not in result
+        with pytest.raises(KeyError):
+            result['sentiment']
+    
+    def test_analyze_batch_matches_single_analysis(self):
+        """Test batch analysis agrees with per-message analysis"""
+        messages = ["I love it!", "This is terrible", "The product exists"]
+        results = self.analyzer.analyze_batch(messages)
+        assert results == [self.analyzer.analyze_message(msg) for msg in messages]
+        assert self.analyzer.analyze_batch([]) == []
+    
+    def test_blank_message_skips_vader(self):
+        """Test blank messages return a neutral record matching VADER's own result"""
+        info_before = _analyze_cached.cache_info()
+        result = self.analyzer.analyze_message("   ")
+        batch = self.analyzer.analyze_batch(["", "\n"])
+        info_after = _analyze_cached.cache_info()
+        assert (info_after.hits, info_after.misses) == (info_before.hits, info_before.misses)
+        
+        vader = _get_vader().polarity_scores("")
+        expected = (vader['compound'], vader['pos'], vader['neu'], vader['neg'], 'Neutral')
+        assert result == expected
+        assert batch == [expected, expected]
+    
     def test_conversation_analysis_empty(self):
         """Test conversation analysis with no messages"""
         result = self.analyzer.analyze_conversation([])
@@ -68,6 +108,29 @@ class TestSentimentAnalyzer:
         result = self.analyzer.analyze_conversation(messages)
         assert 'mood_shift' in result
     
+    def test_mood_shift_direction(self):
+        """Test mood shift compares first and second half averages"""
+        def mood_shift(compounds):
+            return self.analyzer._detect_mood_shift(list(accumulate(compounds, initial=0.0)))
+        
+        assert mood_shift([-0.8, -0.4, 0.5, 0.8]).startswith('Improving')
+        assert mood_shift([0.8, -0.6]).startswith('Declining')
+        assert mood_shift([0.3, 0.3, 0.3]).startswith('Stable')
+        assert mood_shift([0.3]) == "Insufficient data"
+    
+    def test_conversation_analysis_reuses_stored_sentiment(self):
+        """Test stored sentiments are reused instead of re-analyzed"""
+        stored = {'compound': -0.9, 'positive': 0.0, 'neutral': 0.1,
+                  'negative': 0.9, 'label': 'Negative'}
+        messages = [
+            ('user', 'I love it!', stored),
+            ('bot', 'Great!', None),
+            ('user', 'I love it!')
+        ]
+        result = self.analyzer.analyze_conversation(messages)
+        assert result['individual_scores'][0] is stored
+        assert result['individual_scores'][1]['label'] == 'Positive'
+    
     def test_sentiment_label_boundaries(self):
         """Test sentiment label threshold boundaries"""
         # Test positive threshold
@@ -82,6 +145,14 @@ class TestSentimentAnalyzer:
         assert self.analyzer._get_sentiment_label(0.04) == 'Neutral'
         assert self.analyzer._get_sentiment_label(-0.04) == 'Neutral'
         assert self.analyzer._get_sentiment_label(0.0) == 'Neutral'
+    
+    def test_repeated_message_uses_cache(self):
+        """Test repeated messages are served from the score cache"""
+        first = self.analyzer.analyze_message("Thanks, that was helpful!")
+        hits_before = _analyze_cached.cache_info().hits
+        second = self.analyzer.analyze_message("  Thanks, that was helpful!  ")
+        assert _analyze_cached.cache_info().hits == hits_before + 1
+        assert first == second
 
 
 class TestSentimentChatbot:
@@ -100,7 +171,7 @@ class TestSentimentChatbot:
         """Test message processing"""
         response, sentiment = self.chatbot.process_message("Hello!")
         assert response is not None
-        assert 'label' in sentiment
+        assert 'label' in sentiment._asdict()
         assert len(self.chatbot.conversation_history) == 2  # User + Bot
     
     def test_conversation_history_storage(self):
@@ -112,6 +183,18 @@ class TestSentimentChatbot:
         assert len(history) == 4  # 2 user + 2 bot messages
         assert history[0][0] == 'user'
         assert history[1][0] == 'bot'
+        assert history[0][2]['label'] in ['Positive', 'Neutral', 'Negative']
+        assert history[1][2] is None
+    
+    def test_seeded_responses_are_reproducible(self):
+        """Test seeding the chatbot's generator makes replies repeatable"""
+        self.chatbot._rng.seed(0)
+        first = [self.chatbot.process_message(msg)[0] for msg in ("Hello", "This is great")]
+        
+        other = SentimentChatbot()
+        other._rng.seed(0)
+        second = [other.process_message(msg)[0] for msg in ("Hello", "This is great")]
+        assert first == second
     
     def test_greeting_detection(self):
         """Test greeting detection in responses"""
@@ -147,6 +230,33 @@ class TestSentimentChatbot:
         assert 'sentiment_distribution' in analysis
         assert analysis['message_count'] == 3
     
+    def test_running_stats_match_full_analysis(self):
+        """Test incremental analysis matches re-analyzing the whole history"""
+        for msg in ("I'm happy", "This is okay", "I'm sad", "Terrible service"):
+            self.chatbot.process_message(msg)
+        
+        incremental = self.chatbot.get_conversation_analysis()
+        full = self.chatbot.sentiment_analyzer.analyze_conversation(
+            [(role, message) for role, message, _ in self.chatbot.conversation_history]
+        )
+        assert incremental == full
+    
+    def test_bounded_history(self):
+        """Test max_history keeps only the most recent entries"""
+        chatbot = SentimentChatbot(max_history=4)
+        for msg in ("First message", "Second message", "Third message"):
+            chatbot.process_message(msg)
+        
+        history = chatbot.get_conversation_history()
+        assert len(history) == 4
+        assert history[0][1] == "Second message"
+        assert history[-1:] == [history[3]]
+        
+        # Totals cover the whole session; per-message scores only retained messages
+        analysis = chatbot.get_conversation_analysis()
+        assert analysis['message_count'] == 3
+        assert len(analysis['individual_scores']) == 2
+    
     def test_reset_conversation(self):
         """Test conversation reset functionality"""
         self.chatbot.process_message("Test message")
@@ -154,6 +264,7 @@ class TestSentimentChatbot:
         
         self.chatbot.reset_conversation()
         assert len(self.chatbot.conversation_history) == 0
+        assert self.chatbot.get_conversation_analysis()['message_count'] == 0
     
     def test_empty_message_handling(self):
         """Test handling of edge cases"""
@@ -174,6 +285,37 @@ class TestSentimentChatbot:
         # Test thank you detection
         response3, _ = self.chatbot.process_message("Thank you so much")
         assert len(response3) > 0
+    
+    def test_intent_priority(self):
+        """Test intents are answered in priority order"""
+        response, _ = self.chatbot.process_message("Thanks, but the price is a problem")
+        assert response.startswith("I'm sorry you're experiencing technical difficulties")
+        
+        # A known user is not greeted again; the next matched intent answers
+        self.chatbot.user_name = "Sam"
+        response, _ = self.chatbot.process_message("Hi, thanks for the help")
+        assert response.startswith("You're very welcome")
+    
+    def test_intent_keywords_match_whole_words(self):
+        """Test intent keywords do not match inside other words"""
+        assert _detect_intents("hi there") == {'greeting'}
+        assert _detect_intents("HELLO There") == {'greeting'}
+        assert not _detect_intents("this is fine")
+        assert not _detect_intents("i like the costume")
+        assert _detect_intents("ok, see you later") == {'farewell'}
+        assert _detect_intents("thanks, but the price is a problem") == {'thanks', 'price', 'problem'}
+        assert _detect_intents("I said 'hello'") == {'greeting'}
+        assert _detect_intents("'Problems' with 'prices'") == {'problem', 'price'}
+        assert _detect_intents("There are issues") == {'problem'}
+    
+    def test_intent_keywords_match_inflected_forms(self):
+        """Test plural and inflected keyword forms still trigger their intent"""
+        assert _detect_intents("I have problems with my order") == {'problem'}
+        assert _detect_intents("There are issues") == {'problem'}
+        assert _detect_intents("so many errors and bugs") == {'problem'}
+        assert _detect_intents("Prices are too high") == {'price'}
+        assert _detect_intents("I really appreciated it") == {'thanks'}
+        assert _detect_intents("I'm thankful") == {'thanks'}
 
 
 class TestIntegration: